@@ -5,7 +5,7 @@ if __name__ == "__main__":
     profile_run = profile_func(
         ProfileRunSettings(
             func=run.get_letters_and_numbers,
-            func_file_names=[run.letters.__file__, run.numbers.__file__],
+            func_file_names=(run.letters.__file__, run.numbers.__file__),
         )
     )
 
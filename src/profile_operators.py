@@ -1,9 +1,28 @@
-import linecache
+import heapq
+import io
+import multiprocessing
+import sys
+import tokenize
 import tracemalloc
-from dataclasses import dataclass
-from tracemalloc import Snapshot, Statistic, StatisticDiff
-from typing import Callable
+from collections import defaultdict
+from dataclasses import dataclass, field
+from tracemalloc import Snapshot, Statistic, StatisticDiff, Traceback
+from typing import Callable, Iterator
 from enum import Enum
+from multiprocessing.connection import Connection
+
+
+# filter_traces stops at the first exclusive filter a trace fails, so the most
+# common noise goes first
+_NOISE_FILTERS = (
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+def _is_file_pattern(name: str) -> bool:
+    return any(char in name for char in "*?[")
 
 
 class TraceKeyType(Enum):
@@ -12,20 +31,172 @@ class TraceKeyType(Enum):
     TRACEBACK = "traceback"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProfileRunSettings:
     func: Callable
-    func_file_names: list[str]
+    func_file_names: tuple[str, ...]
     run_count: int = 3
-    key_type: TraceKeyType = TraceKeyType.LINE_NUM
+    # grouping by file keeps one statistic per file rather than one per line, so
+    # far fewer are built and ranked; pass LINE_NUM to see the allocating lines
+    key_type: TraceKeyType = TraceKeyType.FILENAME
     limit: int = 10
     exclusive_filter: bool = True
+    isolate_runs: bool = False
+    _file_name_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    _file_filters: tuple[tracemalloc.Filter, ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _has_file_patterns: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.run_count < 1:
+            raise ValueError(f"run_count must be at least 1, got {self.run_count}")
+        object.__setattr__(self, "func_file_names", tuple(self.func_file_names))
+        file_filters = tuple(
+            tracemalloc.Filter(True, name) for name in self.func_file_names
+        )
+        object.__setattr__(self, "_file_filters", file_filters)
+        # names come from each Filter's normalized pattern (e.g. .pyc -> .py) so
+        # both exclusive paths match alike; glob patterns can't be matched by set
+        # lookup, so their presence sends filtering through the Filters instead
+        filter_names = [f.filename_pattern for f in file_filters]
+        has_file_patterns = any(_is_file_pattern(name) for name in filter_names)
+        object.__setattr__(self, "_has_file_patterns", has_file_patterns)
+        file_name_set = frozenset(
+            sys.intern(name) for name in filter_names if not _is_file_pattern(name)
+        )
+        object.__setattr__(self, "_file_name_set", file_name_set)
+
+
+_SOURCE_CACHE: dict[str, list[str]] = {}
+
+
+def _read_source(filename: str) -> list[str]:
+    try:
+        with tokenize.open(filename) as source:
+            # readlines splits on newlines only, like linecache; splitlines would
+            # also break on form feeds and shift every later line number
+            return source.readlines()
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+
+
+def _source_line(filename: str, lineno: int) -> str:
+    lines = _SOURCE_CACHE.get(filename)
+    if lines is None:
+        lines = _SOURCE_CACHE[filename] = _read_source(filename)
+    return lines[lineno - 1].strip() if 0 < lineno <= len(lines) else ""
+
+
+def _iter_traces(
+    snapshot: Snapshot,
+) -> Iterator[tuple[int, tuple[tuple[str, int], ...]]]:
+    # CPython keeps each trace as a (domain, size, frames, total_nframe) tuple
+    # with frames newest first, the order Traceback() expects. Reading those
+    # skips building a Trace and Frame per trace; the public API is the
+    # fallback should that private layout go away.
+    raw_traces = getattr(snapshot.traces, "_traces", None)
+    if raw_traces is None:
+        for trace in snapshot.traces:
+            frames = tuple(
+                (frame.filename, frame.lineno) for frame in reversed(trace.traceback)
+            )
+            yield trace.size, frames
+        return
+    for _, size, frames, _ in raw_traces:
+        yield size, frames
+
+
+def _statistic_sort_key(stat: Statistic) -> tuple:
+    return (stat.size, stat.count, stat.traceback)
+
+
+def _statistic_diff_sort_key(stat: StatisticDiff) -> tuple:
+    return (
+        abs(stat.size_diff),
+        stat.size,
+        abs(stat.count_diff),
+        stat.count,
+        stat.traceback,
+    )
+
+
+def _group_statistics(
+    snapshot: Snapshot,
+    key_type: TraceKeyType,
+    file_name_set: frozenset[str] | None = None,
+) -> tuple[list[Statistic], int]:
+    sizes: defaultdict[tuple, int] = defaultdict(int)
+    counts: defaultdict[tuple, int] = defaultdict(int)
+    total_size = 0
+    for size, frames in _iter_traces(snapshot):
+        if file_name_set is not None and frames[0][0] not in file_name_set:
+            continue
+        if key_type == TraceKeyType.LINE_NUM:
+            key = frames[:1]
+        elif key_type == TraceKeyType.FILENAME:
+            key = ((frames[0][0], 0),)
+        else:
+            key = frames
+        sizes[key] += size
+        counts[key] += 1
+        total_size += size
+    stats = [
+        Statistic(Traceback(key), size, counts[key]) for key, size in sizes.items()
+    ]
+    return stats, total_size
+
+
+def _compare_statistics(
+    new_stats: list[Statistic], old_stats: list[Statistic]
+) -> list[StatisticDiff]:
+    old_by_traceback = {stat.traceback: stat for stat in old_stats}
+    diff: list[StatisticDiff] = []
+    for stat in new_stats:
+        previous = old_by_traceback.pop(stat.traceback, None)
+        if previous is None:
+            diff.append(
+                StatisticDiff(
+                    stat.traceback, stat.size, stat.size, stat.count, stat.count
+                )
+            )
+        else:
+            diff.append(
+                StatisticDiff(
+                    stat.traceback,
+                    stat.size,
+                    stat.size - previous.size,
+                    stat.count,
+                    stat.count - previous.count,
+                )
+            )
+    for stat in old_by_traceback.values():
+        diff.append(StatisticDiff(stat.traceback, 0, -stat.size, 0, -stat.count))
+    diff.sort(key=_statistic_diff_sort_key, reverse=True)
+    return diff
 
 
 class StatisticRun:
+    __slots__ = (
+        "position",
+        "statistic",
+        "filename",
+        "lineno",
+        "size_kib",
+        "nframe",
+        "_line",
+    )
+
     def __init__(self, position: int, statistic: Statistic) -> None:
         self.position = position + 1
         self.statistic = statistic
+        frame = statistic.traceback[0]
+        self.filename = frame.filename
+        self.lineno = frame.lineno
+        self.size_kib = statistic.size / 1024
+        self.nframe = statistic.traceback.total_nframe
+        line = _source_line(self.filename, self.lineno)
+        self._line = f"\t\t{line}" if line else None
 
     def __str__(self) -> str:
         return (
@@ -36,20 +207,34 @@ class StatisticRun:
 
     @property
     def file_trace(self) -> str:
-        frame = self.statistic.traceback[0]
-        return f"\t#{self.position}: {self.statistic.size / 1024}KiB -> {frame.filename}:{frame.lineno} (traces: {self.statistic.traceback.total_nframe})"
+        return f"\t#{self.position}: {self.size_kib}KiB -> {self.filename}:{self.lineno} (traces: {self.nframe})"
 
     @property
     def line_trace(self) -> str | None:
-        frame = self.statistic.traceback[0]
-        line = linecache.getline(frame.filename, frame.lineno).strip()
-        return f"\t\t{line}" if line is not None else None
+        return self._line
 
 
 class StatisticDiffRun:
+    __slots__ = (
+        "position",
+        "statistic",
+        "filename",
+        "lineno",
+        "size_kib",
+        "nframe",
+        "_line",
+    )
+
     def __init__(self, position: int, statistic: StatisticDiff) -> None:
         self.position = position + 1
         self.statistic = statistic
+        frame = statistic.traceback[0]
+        self.filename = frame.filename
+        self.lineno = frame.lineno
+        self.size_kib = statistic.size_diff / 1024
+        self.nframe = statistic.traceback.total_nframe
+        line = _source_line(self.filename, self.lineno)
+        self._line = f"\t\t{line}" if line else None
 
     def __str__(self) -> str:
         return (
@@ -60,17 +245,23 @@ class StatisticDiffRun:
 
     @property
     def file_trace(self) -> str:
-        frame = self.statistic.traceback[0]
-        return f"\t#{self.position}: {self.statistic.size_diff / 1024}KiB -> {frame.filename}:{frame.lineno} (traces: {self.statistic.traceback.total_nframe})"
+        return f"\t#{self.position}: {self.size_kib}KiB -> {self.filename}:{self.lineno} (traces: {self.nframe})"
 
     @property
     def line_trace(self) -> str | None:
-        frame = self.statistic.traceback[0]
-        line = linecache.getline(frame.filename, frame.lineno).strip()
-        return f"\t\t{line}" if line is not None else None
+        return self._line
 
 
 class SnapshotRun:
+    __slots__ = (
+        "iteration",
+        "snapshot",
+        "settings",
+        "_filtered_snapshot",
+        "_grouped",
+        "_top",
+    )
+
     def __init__(
         self,
         iteration: int,
@@ -80,90 +271,122 @@ class SnapshotRun:
         self.iteration = iteration
         self.snapshot = snapshot
         self.settings = settings
+        self._filtered_snapshot: Snapshot | None = None
+        self._grouped: tuple[list[Statistic], int] | None = None
+        self._top: list[Statistic] | None = None
 
     def __str__(self) -> str:
+        buf = io.StringIO()
+        self.render(buf)
+        return buf.getvalue()
+
+    def render(self, buf: io.StringIO) -> None:
         title = (
             f"\n## Snapshot Run #{self.iteration}"
             if self.iteration != 0
             else "\n## Snapshot Before Run"
         )
-        return "\n".join(
-            [
-                title,
-                f"### Top {self.settings.limit} Memory Hogs:",
-                "\n".join([str(stat) for stat in self.top_stats]),
-                "\n### Summary:",
-                f"\tTop Total Size: {self.top_stats_summary}",
-                f"\tRemaining Total Size: {self.remaining_stats_summary}",
-            ]
-        )
+        buf.write(title)
+        buf.write(f"\n### Top {self.settings.limit} Memory Hogs:\n")
+        for i, stat in enumerate(self._top_stats):
+            if i > 0:
+                buf.write("\n")
+            buf.write(str(StatisticRun(i, stat)))
+        top_summary, remaining_summary = self.__summaries()
+        buf.write("\n\n### Summary:\n")
+        buf.write(f"\tTop Total Size: {top_summary}\n")
+        buf.write(f"\tRemaining Total Size: {remaining_summary}")
 
     @property
     def __inclusive_filtered(self) -> Snapshot:
-        return self.snapshot.filter_traces(
-            (
-                tracemalloc.Filter(False, tracemalloc.__file__),
-                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
-                tracemalloc.Filter(False, "<unknown>"),
-            )
-        )
+        return self.snapshot.filter_traces(_NOISE_FILTERS)
 
     @property
     def __exclusive_filtered(self) -> Snapshot:
-        return self.snapshot.filter_traces(
-            [
-                tracemalloc.Filter(True, func_file_name)
-                for func_file_name in self.settings.func_file_names
-            ],
-        )
+        return self.snapshot.filter_traces(self.settings._file_filters)
 
     @property
     def filtered_snapshot(self) -> Snapshot:
-        return (
-            self.__exclusive_filtered
-            if self.settings.exclusive_filter
-            else self.__inclusive_filtered
-        )
+        if self._filtered_snapshot is None:
+            self._filtered_snapshot = (
+                self.__exclusive_filtered
+                if self.settings.exclusive_filter
+                else self.__inclusive_filtered
+            )
+        return self._filtered_snapshot
 
     @property
-    def top_stats(self) -> list[StatisticRun]:
-        return [
-            StatisticRun(i, stat)
-            for i, stat in enumerate(
-                self.filtered_snapshot.statistics(self.settings.key_type.value)[
-                    : self.settings.limit
-                ]
+    def _grouped_stats(self) -> tuple[list[Statistic], int]:
+        if self._grouped is None:
+            if self.settings.exclusive_filter and not self.settings._has_file_patterns:
+                # exact file names are matched by set lookup while grouping, so
+                # the trace table is walked once without building a filtered
+                # snapshot; as with filter_traces(()), no names keeps every trace
+                self._grouped = _group_statistics(
+                    self.snapshot,
+                    self.settings.key_type,
+                    self.settings._file_name_set or None,
+                )
+            else:
+                self._grouped = _group_statistics(
+                    self.filtered_snapshot, self.settings.key_type
+                )
+        return self._grouped
+
+    @property
+    def _all_stats(self) -> list[Statistic]:
+        return self._grouped_stats[0]
+
+    @property
+    def _top_stats(self) -> list[Statistic]:
+        if self._top is None:
+            self._top = heapq.nlargest(
+                self.settings.limit, self._all_stats, key=_statistic_sort_key
             )
-        ]
+        return self._top
+
+    @property
+    def top_stats(self) -> list[StatisticRun]:
+        return [StatisticRun(i, stat) for i, stat in enumerate(self._top_stats)]
 
     @property
     def top_stats_summary(self) -> str:
-        return self.__total_size_line(self.top_stats)
+        return self.__summaries()[0]
 
     @property
     def remaining_stats(self) -> list[StatisticRun]:
-        return [
-            StatisticRun(i, stat)
-            for i, stat in enumerate(
-                self.filtered_snapshot.statistics(self.settings.key_type.value)[
-                    self.settings.limit :
-                ]
-            )
-        ]
+        top_ids = {id(stat) for stat in self._top_stats}
+        remaining = sorted(
+            (stat for stat in self._all_stats if id(stat) not in top_ids),
+            key=_statistic_sort_key,
+            reverse=True,
+        )
+        return [StatisticRun(i, stat) for i, stat in enumerate(remaining)]
 
     @property
     def remaining_stats_summary(self) -> str:
-        return self.__total_size_line(self.remaining_stats)
+        return self.__summaries()[1]
+
+    def __summaries(self) -> tuple[str, str]:
+        # the remaining total comes from the running total kept while grouping,
+        # so the tail is never walked
+        _, total_size = self._grouped_stats
+        top_count = len(self._top_stats)
+        top_total = sum(stat.size for stat in self._top_stats)
+        return (
+            self.__total_size_line(top_count, top_total),
+            self.__total_size_line(
+                len(self._all_stats) - top_count, total_size - top_total
+            ),
+        )
 
-    def __total_size_line(self, stats: list[StatisticRun]) -> str:
-        summary_line = ""
-        if stats is not None and len(stats) > 0:
-            total_size = sum(stat.statistic.size for stat in stats)
-            summary_line = f"{total_size / 1024} KiB"
-        return summary_line
+    def __total_size_line(self, count: int, total_size: int) -> str:
+        return f"{total_size / 1024} KiB" if count > 0 else ""
 
 
 class SnapshotDiffRun:
+    __slots__ = ("iterations", "diff", "limit")
+
     def __init__(
         self,
         iterations: tuple[int, int],
@@ -175,17 +398,22 @@ class SnapshotDiffRun:
         self.limit = limit
 
     def __str__(self) -> str:
+        buf = io.StringIO()
+        self.render(buf)
+        return buf.getvalue()
+
+    def render(self, buf: io.StringIO) -> None:
         title = f"\n## Snapshot Comparison between #{self.iterations[0]} and #{self.iterations[1]}"
-        return "\n".join(
-            [
-                title,
-                f"### Top {self.limit} Memory Hogs:",
-                "\n".join([str(stat) for stat in self.top_stats]),
-                "\n### Summary:",
-                f"\tTop Total Size: {self.top_stats_summary}",
-                f"\tRemaining Total Size: {self.remaining_stats_summary}",
-            ]
-        )
+        buf.write(title)
+        buf.write(f"\n### Top {self.limit} Memory Hogs:\n")
+        for i, stat in enumerate(self.diff[: self.limit]):
+            if i > 0:
+                buf.write("\n")
+            buf.write(str(StatisticDiffRun(i, stat)))
+        top_summary, remaining_summary = self.__summaries()
+        buf.write("\n\n### Summary:\n")
+        buf.write(f"\tTop Total Size: {top_summary}\n")
+        buf.write(f"\tRemaining Total Size: {remaining_summary}")
 
     @property
     def top_stats(self) -> list[StatisticDiffRun]:
@@ -195,7 +423,7 @@ class SnapshotDiffRun:
 
     @property
     def top_stats_summary(self) -> str:
-        return self.__total_size_line(self.top_stats)
+        return self.__summaries()[0]
 
     @property
     def remaining_stats(self) -> list[StatisticDiffRun]:
@@ -205,76 +433,175 @@ class SnapshotDiffRun:
 
     @property
     def remaining_stats_summary(self) -> str:
-        return self.__total_size_line(self.remaining_stats)
+        return self.__summaries()[1]
+
+    def __summaries(self) -> tuple[str, str]:
+        top_count = min(len(self.diff), self.limit)
+        top_total = 0
+        remaining_total = 0
+        for i, stat in enumerate(self.diff):
+            if i < top_count:
+                top_total += stat.size_diff
+            else:
+                remaining_total += stat.size_diff
+        return (
+            self.__total_size_line(top_count, top_total),
+            self.__total_size_line(len(self.diff) - top_count, remaining_total),
+        )
 
-    def __total_size_line(self, stats: list[StatisticDiffRun]) -> str:
-        summary_line = ""
-        if stats is not None and len(stats) > 0:
-            total_size = sum(stat.statistic.size_diff for stat in stats)
-            summary_line = f"{total_size / 1024} KiB"
-        return summary_line
+    def __total_size_line(self, count: int, total_size: int) -> str:
+        return f"{total_size / 1024} KiB" if count > 0 else ""
 
 
 class ProfileRun:
+    __slots__ = (
+        "snapshot_runs",
+        "func_file_names",
+        "func_name",
+        "traced_memory",
+        "_comparisons",
+    )
+
     def __init__(
         self,
         snapshot_runs: list[SnapshotRun],
-        func_file_names: list[str],
+        func_file_names: tuple[str, ...],
         func_name: str,
+        traced_memory: list[tuple[int, int]],
     ) -> None:
         self.snapshot_runs = snapshot_runs
         self.func_file_names = func_file_names
         self.func_name = func_name
+        self.traced_memory = traced_memory
+        self._comparisons: list[SnapshotDiffRun] | None = None
 
     def __compare(self, first: SnapshotRun, second: SnapshotRun) -> SnapshotDiffRun:
         return SnapshotDiffRun(
             iterations=(first.iteration, second.iteration),
-            diff=first.filtered_snapshot.compare_to(
-                second.filtered_snapshot, first.settings.key_type.value
-            ),
+            diff=_compare_statistics(second._all_stats, first._all_stats),
         )
 
     @property
     def comparisons(self) -> list[SnapshotDiffRun]:
-        comparisons: list[SnapshotDiffRun] = []
-        for i, _ in enumerate(self.snapshot_runs):
-            if i != 0:
-                comparisons.append(
-                    self.__compare(self.snapshot_runs[i - 1], self.snapshot_runs[i])
-                )
-        return comparisons
+        if self._comparisons is None:
+            comparisons: list[SnapshotDiffRun] = []
+            for i, _ in enumerate(self.snapshot_runs):
+                if i != 0:
+                    comparisons.append(
+                        self.__compare(
+                            self.snapshot_runs[i - 1], self.snapshot_runs[i]
+                        )
+                    )
+            self._comparisons = comparisons
+        return self._comparisons
 
     def __str__(self) -> str:
         settings = self.snapshot_runs[0].settings
-        return "\n".join(
-            [
-                f"# Profile Run For {self.func_name}",
-                "```",
-                "SETTINGS\n",
-                f"- Memory Limit: {settings.limit}",
-                f"- Key Type: {settings.key_type.name}",
-                f"- Exclusive Filter Set: {settings.exclusive_filter}",
-                f"- File Filters Applied: {settings.func_file_names}"
-                if settings.exclusive_filter
-                else "",
-                "```",
-                "\n".join([str(snapshot_run) for snapshot_run in self.snapshot_runs]),
-                f"# Profile Comparisons For {self.func_name}",
-                "\n".join([str(snapshot_run) for snapshot_run in self.snapshot_runs]),
-                f"\n# Profile Comparisons For {self.func_name}",
-                "\n".join([str(comparison) for comparison in self.comparisons]),
-            ]
-        )
+        buf = io.StringIO()
+        buf.write(f"# Profile Run For {self.func_name}\n")
+        buf.write("```\nSETTINGS\n\n")
+        buf.write(f"- Memory Limit: {settings.limit}\n")
+        buf.write(f"- Key Type: {settings.key_type.name}\n")
+        buf.write(f"- Exclusive Filter Set: {settings.exclusive_filter}\n")
+        if settings.exclusive_filter:
+            buf.write(f"- File Filters Applied: {settings.func_file_names}")
+        buf.write("\n```\n")
+        buf.write("\n## Traced Memory Per Run\n")
+        buf.write("| Run | Current | Peak |\n")
+        buf.write("| --- | --- | --- |\n")
+        for i, (current, peak) in enumerate(self.traced_memory, 1):
+            buf.write(f"| #{i} | {current / 1024} KiB | {peak / 1024} KiB |\n")
+        self.__render_joined(buf, self.snapshot_runs)
+        buf.write(f"\n\n# Profile Comparisons For {self.func_name}\n")
+        self.__render_joined(buf, self.comparisons)
+        return buf.getvalue()
+
+    def __render_joined(
+        self, buf: io.StringIO, runs: list[SnapshotRun] | list[SnapshotDiffRun]
+    ) -> None:
+        for i, run in enumerate(runs):
+            if i > 0:
+                buf.write("\n")
+            run.render(buf)
 
 
-def profile_func(settings: ProfileRunSettings) -> ProfileRun:
-    tracemalloc.start()
-    initial_snapshot = SnapshotRun(0, tracemalloc.take_snapshot(), settings)
-    snapshot_runs: list[SnapshotRun] = [initial_snapshot]
+def _run_isolated(func: Callable, conn: Connection) -> None:
+    tracemalloc.start(1)
+    func()
+    traced_memory = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    conn.send((snapshot, traced_memory))
+    conn.close()
+
+
+def _profile_isolated(settings: ProfileRunSettings) -> ProfileRun:
+    # each run gets a fresh spawned process so the parent does no tracing and
+    # no run inherits allocations from the previous one
+    context = multiprocessing.get_context("spawn")
+    snapshot_runs: list[SnapshotRun] = []
+    traced_memory: list[tuple[int, int]] = []
 
     for i in range(1, settings.run_count + 1):
-        settings.func()
-        snapshot_runs.append(SnapshotRun(i, tracemalloc.take_snapshot(), settings))
+        receiver, sender = context.Pipe(duplex=False)
+        try:
+            process = context.Process(
+                target=_run_isolated, args=(settings.func, sender)
+            )
+            process.start()
+            sender.close()
+            try:
+                snapshot, memory = receiver.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(
+                    f"isolated run #{i} exited with code {process.exitcode}"
+                ) from None
+            process.join()
+        finally:
+            sender.close()
+            receiver.close()
+        snapshot_runs.append(SnapshotRun(i, snapshot, settings))
+        traced_memory.append(memory)
+
+    return ProfileRun(
+        snapshot_runs,
+        settings.func_file_names,
+        str(settings.func),
+        traced_memory,
+    )
+
 
+def profile_func(settings: ProfileRunSettings) -> ProfileRun:
+    # the exclusive filter only reports these files, so reading them up front
+    # keeps all source I/O out of both the traced runs and report generation
+    for func_file_name in settings._file_name_set:
+        _SOURCE_CACHE[func_file_name] = _read_source(func_file_name)
+
+    if settings.isolate_runs:
+        return _profile_isolated(settings)
+
+    # only the most recent frame is ever reported, so deeper tracebacks would
+    # cost memory per traced allocation without changing the output
+    tracemalloc.start(1)
+    initial_snapshot = SnapshotRun(0, tracemalloc.take_snapshot(), settings)
+    traced_memory: list[tuple[int, int]] = []
+
+    # a full snapshot copies the whole trace table, so only the final state is
+    # snapshotted and each run records its current and peak traced memory
+    func = settings.func
+    for _ in range(settings.run_count):
+        tracemalloc.reset_peak()
+        func()
+        traced_memory.append(tracemalloc.get_traced_memory())
+
+    final_snapshot = SnapshotRun(
+        settings.run_count, tracemalloc.take_snapshot(), settings
+    )
     tracemalloc.stop()
-    return ProfileRun(snapshot_runs, settings.func_file_names, str(settings.func))
+    return ProfileRun(
+        [initial_snapshot, final_snapshot],
+        settings.func_file_names,
+        str(settings.func),
+        traced_memory,
+    )